@@ -2,8 +2,8 @@
 Document Counter Model
 Stores auto-incrementing counters for invoice, receipt, and waybill numbers.
 """
-from django.db import models
-from django.db import transaction
+from django.db import models, transaction
+from django.db.models import F
 
 
 class DocumentCounter(models.Model):
@@ -30,34 +30,36 @@ class DocumentCounter(models.Model):
         return instance
     
     @classmethod
-    @transaction.atomic
+    def _reserve_next(cls, field):
+        """Atomically increment a counter column and return the reserved value.
+
+        The UPDATE and the read-back run inside one transaction: the row
+        lock the UPDATE takes is held until commit, so a concurrent
+        reservation cannot interleave between the increment and the read
+        and hand out the same number.
+        """
+        with transaction.atomic():
+            updated = cls.objects.filter(pk=1).update(**{field: F(field) + 1})
+            if not updated:
+                cls.objects.get_or_create(pk=1)
+                cls.objects.filter(pk=1).update(**{field: F(field) + 1})
+            new_value = cls.objects.values_list(field, flat=True).get(pk=1)
+        return new_value - 1
+
+    @classmethod
     def get_next_invoice_number(cls):
         """Get the next invoice number and increment counter."""
-        instance = cls.get_instance()
-        current = instance.invoice_counter
-        instance.invoice_counter += 1
-        instance.save()
-        return f"INV-{current:03d}"
-    
+        return f"INV-{cls._reserve_next('invoice_counter'):03d}"
+
     @classmethod
-    @transaction.atomic
     def get_next_receipt_number(cls):
         """Get the next receipt number and increment counter."""
-        instance = cls.get_instance()
-        current = instance.receipt_counter
-        instance.receipt_counter += 1
-        instance.save()
-        return f"REC-{current:03d}"
-    
+        return f"REC-{cls._reserve_next('receipt_counter'):03d}"
+
     @classmethod
-    @transaction.atomic
     def get_next_waybill_number(cls):
         """Get the next waybill number and increment counter."""
-        instance = cls.get_instance()
-        current = instance.waybill_counter
-        instance.waybill_counter += 1
-        instance.save()
-        return f"WAY-{current:03d}"
+        return f"WAY-{cls._reserve_next('waybill_counter'):03d}"
     
     @classmethod
     def get_current_counts(cls):
@@ -1,10 +1,30 @@
 import json
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - stdlib fallback keeps forms working
+    orjson = None
+
+import copy
+
 from django import forms
 
 from .models import Invoice
 
 
+class _ShallowFieldDict(dict):
+    """base_fields mapping whose deepcopy yields shallow per-field copies.
+
+    BaseForm.__init__ deepcopies base_fields on every instantiation, which
+    recursively clones each field's widget and validators. A form is built
+    per API request and the only per-instance mutation is items_payload's
+    .initial, so a shallow copy of each field (sharing widgets) is enough.
+    """
+
+    def __deepcopy__(self, memo):
+        return {name: copy.copy(field) for name, field in self.items()}
+
+
 class InvoiceForm(forms.ModelForm):
     items_payload = forms.CharField(widget=forms.HiddenInput(), required=False)
 
@@ -17,32 +37,76 @@ class InvoiceForm(forms.ModelForm):
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        if self.instance and self.instance.pk:
-            self.fields["items_payload"].initial = json.dumps(self.instance.items or [])
+        if self.instance and self.instance.pk and not self.is_bound:
+            # Bound (POST) forms never render the hidden initial, so only
+            # unbound edit renders pay for serializing the items payload
+            items = self.instance.items or []
+            if orjson is not None:
+                # Widget initial must be str; orjson emits bytes
+                self.fields["items_payload"].initial = orjson.dumps(items).decode()
+            else:
+                self.fields["items_payload"].initial = json.dumps(items)
 
     def save(self, commit=True):
         instance: Invoice = super().save(commit=False)
         items = self.cleaned_data.get("items_payload") or "[]"
         instance.items = self._parse_items(items)
         if commit:
-            instance.save()
+            if instance.pk:
+                # UPDATE only the columns this form can touch; items always
+                # come through the payload and the totals follow from them.
+                # updated_at must be listed or auto_now would be skipped.
+                update_fields = set(self.changed_data) & {
+                    "customer_name", "issue_date", "classification",
+                }
+                update_fields.update(
+                    {"items", "subtotal", "levies", "grand_total", "updated_at"}
+                )
+                instance.save(update_fields=sorted(update_fields))
+            else:
+                instance.save()
         return instance
 
-    def _parse_items(self, payload: str):
+    @staticmethod
+    def _parse_items(payload: str):
         try:
-            parsed = json.loads(payload)
-        except json.JSONDecodeError:
+            if orjson is not None:
+                parsed = orjson.loads(payload)
+            else:
+                parsed = json.loads(payload)
+        except (TypeError, ValueError):
+            # Covers both codecs' decode errors plus non-string payloads
             return []
+        return InvoiceForm._sanitize_items(parsed)
+
+    @staticmethod
+    def _sanitize_items(parsed):
         sanitized = []
+        append = sanitized.append
         for item in parsed:
-            quantity = float(item.get("quantity", 0) or 0)
-            unit_price = float(item.get("unit_price", 0) or 0)
-            sanitized.append(
+            if not isinstance(item, dict):
+                # A decoded payload can hold any JSON value; only objects
+                # describe line items
+                continue
+            get = item.get
+            try:
+                quantity = float(get("quantity") or 0)
+            except (TypeError, ValueError):
+                quantity = 0.0
+            try:
+                unit_price = float(get("unit_price") or 0)
+            except (TypeError, ValueError):
+                unit_price = 0.0
+            append(
                 {
-                    "description": str(item.get("description", "")),
+                    "description": str(get("description", "")),
                     "quantity": quantity,
                     "unit_price": unit_price,
                     "total": round(quantity * unit_price, 2),
                 }
             )
         return sanitized
+
+
+# Swap in the shallow-copying field table once the metaclass has built it
+InvoiceForm.base_fields = _ShallowFieldDict(InvoiceForm.base_fields)
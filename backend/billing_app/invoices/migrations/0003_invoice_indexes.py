@@ -0,0 +1,31 @@
+# Generated by Django 4.2.25 on 2026-08-28 14:36
+
+import django.core.serializers.json
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('invoices', '0002_invoice'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='invoice',
+            name='levies',
+            field=models.JSONField(blank=True, default=dict, encoder=django.core.serializers.json.DjangoJSONEncoder),
+        ),
+        migrations.AddIndex(
+            model_name='invoice',
+            index=models.Index(fields=['-created_at'], name='inv_created_desc_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='invoice',
+            index=models.Index(fields=['customer_name'], name='inv_customer_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='invoice',
+            index=models.Index(fields=['issue_date'], name='inv_issue_date_idx'),
+        ),
+    ]
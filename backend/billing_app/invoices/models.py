@@ -1,7 +1,7 @@
 from decimal import Decimal
 from django.core.serializers.json import DjangoJSONEncoder
-from django.db import models
-from django.db import transaction
+from django.db import models, transaction
+from django.db.models import F
 from django.utils import timezone
 
 from .services import calculator, numbering
@@ -24,55 +24,92 @@ class DocumentCounter(models.Model):
         verbose_name_plural = "Document Counters"
     
     @classmethod
-    def get_instance(cls):
-        """Get or create the singleton counter instance."""
-        instance, created = cls.objects.get_or_create(pk=1)
+    def get_instance(cls, for_update=False):
+        """Get or create the singleton counter instance.
+
+        ``for_update=True`` row-locks the counter for callers that read and
+        then write inside their own ``transaction.atomic`` block; plain
+        reservations go through :meth:`_reserve_next` and need no lock.
+        """
+        queryset = cls.objects.select_for_update() if for_update else cls.objects
+        instance, created = queryset.get_or_create(pk=1)
         return instance
     
     @classmethod
-    @transaction.atomic
+    def _reserve_next(cls, field, count=1):
+        """Atomically advance a counter column and return the first reserved value.
+
+        The UPDATE and the read-back run inside one transaction: the row
+        lock the UPDATE takes is held until commit, so a concurrent
+        reservation cannot interleave between the increment and the read
+        and hand out the same number.
+        """
+        with transaction.atomic():
+            updated = cls.objects.filter(pk=1).update(**{field: F(field) + count})
+            if not updated:
+                cls.objects.get_or_create(pk=1)
+                cls.objects.filter(pk=1).update(**{field: F(field) + count})
+            new_value = cls.objects.values_list(field, flat=True).get(pk=1)
+        return new_value - count
+
+    @classmethod
+    def reserve_block(cls, field, count):
+        """Reserve `count` consecutive numbers in one round-trip.
+
+        Returns the first reserved value; callers format the rest locally,
+        which turns N reservation round-trips into one for bulk flows.
+        """
+        return cls._reserve_next(field, count)
+
+    @classmethod
     def get_next_invoice_number(cls):
         """Get the next invoice number and increment counter."""
-        instance = cls.get_instance()
-        current = instance.invoice_counter
-        instance.invoice_counter += 1
-        instance.save()
-        return f"INV-{current:04d}"
-    
+        return f"INV-{cls._reserve_next('invoice_counter'):04d}"
+
     @classmethod
-    @transaction.atomic
     def get_next_receipt_number(cls):
         """Get the next receipt number and increment counter."""
-        instance = cls.get_instance()
-        current = instance.receipt_counter
-        instance.receipt_counter += 1
-        instance.save()
-        return f"REC-{current:04d}"
-    
+        return f"REC-{cls._reserve_next('receipt_counter'):04d}"
+
     @classmethod
-    @transaction.atomic
     def get_next_waybill_number(cls):
         """Get the next waybill number and increment counter."""
-        instance = cls.get_instance()
-        current = instance.waybill_counter
-        instance.waybill_counter += 1
-        instance.save()
-        return f"WB-{current:04d}"
+        return f"WB-{cls._reserve_next('waybill_counter'):04d}"
     
     @classmethod
     def get_current_counts(cls):
         """Get current counts for all document types."""
-        instance = cls.get_instance()
+        row = cls.objects.filter(pk=1).values(
+            'invoice_counter', 'receipt_counter', 'waybill_counter'
+        ).first()
+        if row is None:
+            instance = cls.get_instance()
+            row = {
+                'invoice_counter': instance.invoice_counter,
+                'receipt_counter': instance.receipt_counter,
+                'waybill_counter': instance.waybill_counter,
+            }
         return {
-            'invoices': instance.invoice_counter - 1,  # Current count is last used
-            'receipts': instance.receipt_counter - 1,
-            'waybills': instance.waybill_counter - 1,
+            'invoices': row['invoice_counter'] - 1,  # Current count is last used
+            'receipts': row['receipt_counter'] - 1,
+            'waybills': row['waybill_counter'] - 1,
         }
     
     def __str__(self):
         return f"Counters: INV={self.invoice_counter}, REC={self.receipt_counter}, WB={self.waybill_counter}"
 
 
+class InvoiceManager(models.Manager):
+    def for_list(self):
+        """Narrow queryset for list renderings.
+
+        Defers the items and levies JSONFields — the widest columns on the
+        row, easily kilobytes on long invoices — since list surfaces only
+        need the number, customer and total.
+        """
+        return self.only("id", "customer_name", "grand_total", "created_at")
+
+
 class Invoice(models.Model):
     customer_name = models.CharField(max_length=255)
     issue_date = models.DateField(default=timezone.now)
@@ -84,8 +121,28 @@ class Invoice(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = InvoiceManager()
+
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            # Matches the default ordering so list queries walk the index
+            # instead of sorting every row
+            models.Index(fields=["-created_at"], name="inv_created_desc_idx"),
+            models.Index(fields=["customer_name"], name="inv_customer_idx"),
+            models.Index(fields=["issue_date"], name="inv_issue_date_idx"),
+        ]
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Rows loaded from the DB already carry consistent totals; only a
+        # reassignment of `items` (or a brand-new row) forces a recalculation
+        self._items_dirty = self.pk is None
+
+    def __setattr__(self, name, value):
+        if name == "items":
+            self.__dict__["_items_dirty"] = True
+        super().__setattr__(name, value)
 
     @property
     def invoice_number(self) -> str:
@@ -94,12 +151,41 @@ class Invoice(models.Model):
     def recalculate(self) -> None:
         totals = calculator.calculate_totals(self.items)
         self.subtotal = totals.subtotal
-        self.levies = totals.levies
+        # Store levies as plain floats: they serialize natively in the
+        # JSONField (no Decimal->str encoding) and deserialize as numbers,
+        # already response-shaped for the API
+        self.levies = {name: float(amount) for name, amount in totals.levies.items()}
         self.grand_total = totals.grand_total
 
     def save(self, *args, **kwargs):
-        self.recalculate()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "items" not in update_fields:
+            # The totals columns will not be written anyway, so even a dirty
+            # items list is not worth recalculating on this save
+            pass
+        elif getattr(self, "_items_dirty", True) or self.pk is None:
+            self.recalculate()
+            self._items_dirty = False
+            if update_fields is not None:
+                # A save scoped to items must also persist the totals the
+                # recalculation just produced
+                kwargs["update_fields"] = set(update_fields) | {
+                    "subtotal", "levies", "grand_total",
+                }
         super().save(*args, **kwargs)
 
+    @classmethod
+    def bulk_create_invoices(cls, invoices, batch_size=1000):
+        """Insert many invoices in batched statements instead of N saves.
+
+        bulk_create bypasses save(), so totals are recalculated here first;
+        invoice numbers need no reservation because they are formatted from
+        the assigned primary keys. Cuts N INSERT round-trips to ~N/batch.
+        """
+        for invoice in invoices:
+            invoice.recalculate()
+            invoice._items_dirty = False
+        return cls.objects.bulk_create(invoices, batch_size=batch_size)
+
     def __str__(self) -> str:  # pragma: no cover - simple representation
         return self.invoice_number
@@ -1,8 +1,10 @@
+import functools
 from dataclasses import dataclass
-from decimal import Decimal, ROUND_HALF_UP
+from decimal import Context, Decimal, ROUND_HALF_UP
 from typing import Dict, Iterable
 
 from django.conf import settings
+from django.test.signals import setting_changed
 
 
 @dataclass
@@ -12,26 +14,79 @@ class InvoiceTotals:
     grand_total: Decimal
 
 
+TWO_PLACES = Decimal("0.01")
+_ZERO = Decimal("0.00")
+
+# Shared rounding context: Context.quantize carries the rounding mode, so
+# call sites skip the per-call keyword handling of Decimal.quantize
+_ROUND_CTX = Context(rounding=ROUND_HALF_UP)
+
+
+@functools.lru_cache(maxsize=1)
+def _tax_rates():
+    # TAX_SETTINGS is fixed for the process lifetime, so the Decimal
+    # conversions happen once instead of per levy per invoice
+    return tuple((name, Decimal(str(rate))) for name, rate in settings.TAX_SETTINGS.items())
+
+
+def _reset_tax_rates(*, setting, **kwargs):
+    # override_settings in tests is the only runtime mutation path
+    if setting == "TAX_SETTINGS":
+        _tax_rates.cache_clear()
+
+
+setting_changed.connect(_reset_tax_rates)
+
+
 def _to_decimal(value) -> Decimal:
-    if isinstance(value, Decimal):
+    # Type-dispatched fast paths: this runs twice per line item, so the
+    # common int/Decimal inputs skip the stringify-then-parse round trip.
+    # Exact type checks are deliberate — these are JSON scalars, not
+    # subclasses.
+    if not value:
+        return _ZERO
+    kind = type(value)
+    if kind is Decimal:
         return value
-    return Decimal(str(value or 0)).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+    if kind is int:
+        # Ints are exact; every consumer quantizes its end result anyway
+        return Decimal(value)
+    return _ROUND_CTX.quantize(Decimal(str(value)), TWO_PLACES)
 
 
 def calculate_totals(items: Iterable[dict]) -> InvoiceTotals:
-    subtotal = sum(
-        _to_decimal(item.get("quantity", 0)) * _to_decimal(item.get("unit_price", 0))
-        for item in items or []
-    ).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
-
-    levies: Dict[str, Decimal] = {}
-    levy_total = Decimal("0.00")
-    for levy_name, rate in settings.TAX_SETTINGS.items():
-        levy_amount = (subtotal * Decimal(str(rate))).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
-        levies[levy_name] = levy_amount
-        levy_total += levy_amount
-
-    grand_total = subtotal + levy_total
-    grand_total = grand_total.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+    # Single-pass accumulation; invoice amounts stay Decimal end to end so
+    # preview and saved totals round identically
+    if not items:
+        # Blank drafts and cleared previews are common; skip the Decimal
+        # multiplies and quantizes entirely. Fresh dict per call — callers
+        # assign levies onto model instances and may mutate it.
+        return InvoiceTotals(
+            subtotal=_ZERO,
+            levies={name: _ZERO for name, _ in _tax_rates()},
+            grand_total=_ZERO,
+        )
+    subtotal = Decimal("0")
+    for item in items or ():
+        subtotal += _to_decimal(item.get("quantity", 0)) * _to_decimal(item.get("unit_price", 0))
+    subtotal = _ROUND_CTX.quantize(subtotal, TWO_PLACES)
+    if not subtotal:
+        # Zero-quantity drafts still reach here with items present; every
+        # levy of zero is zero, so skip the multiplies
+        return InvoiceTotals(
+            subtotal=_ZERO,
+            levies={name: _ZERO for name, _ in _tax_rates()},
+            grand_total=_ZERO,
+        )
+
+    # One comprehension allocates the dict at its final size instead of
+    # growing it insert by insert
+    levies: Dict[str, Decimal] = {
+        levy_name: _ROUND_CTX.quantize(subtotal * rate, TWO_PLACES)
+        for levy_name, rate in _tax_rates()
+    }
+    levy_total = sum(levies.values(), _ZERO)
+
+    grand_total = _ROUND_CTX.quantize(subtotal + levy_total, TWO_PLACES)
 
     return InvoiceTotals(subtotal=subtotal, levies=levies, grand_total=grand_total)
@@ -1,4 +1,10 @@
+import functools
+
+
+@functools.lru_cache(maxsize=4096)
 def format_invoice_number(pk: int | None) -> str:
+    # Called per render and per API row for a small set of live pks, so the
+    # formatted strings are worth interning behind an lru_cache
     if pk is None:
         return "INV-NEW"
     return f"INV-{pk:05d}"
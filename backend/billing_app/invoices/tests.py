@@ -1,10 +1,177 @@
+import json
 from decimal import Decimal
 
-from django.test import SimpleTestCase, override_settings
+from django.test import SimpleTestCase, TestCase, override_settings
 
+from .models import DocumentCounter, Invoice
 from .services import calculator, numbering
 
 
+class InvoiceRecalculateTests(TestCase):
+    def test_recalculates_when_items_assigned(self):
+        invoice = Invoice.objects.create(
+            customer_name="ACME",
+            items=[{"description": "Widget", "quantity": 1, "unit_price": 100}],
+        )
+        self.assertEqual(invoice.subtotal, Decimal("100.00"))
+        invoice.items = [{"description": "Widget", "quantity": 2, "unit_price": 100}]
+        invoice.save()
+        self.assertEqual(invoice.subtotal, Decimal("200.00"))
+
+    def test_skips_recalculation_when_items_untouched(self):
+        invoice = Invoice.objects.create(
+            customer_name="ACME",
+            items=[{"description": "Widget", "quantity": 1, "unit_price": 100}],
+        )
+        reloaded = Invoice.objects.get(pk=invoice.pk)
+        reloaded.customer_name = "ACME Ltd"
+        reloaded.subtotal = Decimal("999.00")  # would be clobbered by recalculate
+        reloaded.save()
+        self.assertEqual(reloaded.subtotal, Decimal("999.00"))
+
+    def test_bulk_create_recalculates_totals(self):
+        invoices = Invoice.bulk_create_invoices([
+            Invoice(
+                customer_name=f"Customer {i}",
+                items=[{"description": "Widget", "quantity": i, "unit_price": 10}],
+            )
+            for i in range(1, 4)
+        ])
+        self.assertEqual([inv.subtotal for inv in invoices],
+                         [Decimal("10.00"), Decimal("20.00"), Decimal("30.00")])
+
+    def test_for_list_defers_wide_json_columns(self):
+        Invoice.objects.create(
+            customer_name="ACME",
+            items=[{"description": "Widget", "quantity": 1, "unit_price": 100}],
+        )
+        invoice = Invoice.objects.for_list().get()
+        self.assertEqual(invoice.get_deferred_fields(), {
+            "issue_date", "classification", "items", "subtotal", "levies", "updated_at",
+        })
+        self.assertEqual(invoice.grand_total, Decimal("121.00"))
+
+
+class DocumentCounterTests(TestCase):
+    def test_reserves_sequential_numbers(self):
+        self.assertEqual(DocumentCounter.get_next_invoice_number(), "INV-0001")
+        self.assertEqual(DocumentCounter.get_next_invoice_number(), "INV-0002")
+        self.assertEqual(DocumentCounter.get_next_receipt_number(), "REC-0001")
+        self.assertEqual(DocumentCounter.get_next_waybill_number(), "WB-0001")
+
+    def test_reserve_block_advances_counter_once(self):
+        start = DocumentCounter.reserve_block("invoice_counter", 5)
+        self.assertEqual(start, 1)
+        self.assertEqual(DocumentCounter.get_next_invoice_number(), "INV-0006")
+
+    def test_counts_reflect_reservations(self):
+        DocumentCounter.get_next_invoice_number()
+        counts = DocumentCounter.get_current_counts()
+        self.assertEqual(counts["invoices"], 1)
+        self.assertEqual(counts["receipts"], 0)
+
+
+class InvoiceApiTests(TestCase):
+    def test_create_and_get_roundtrip(self):
+        response = self.client.post(
+            "/invoices/api/create/",
+            json.dumps({
+                "customer_name": "ACME",
+                "items_payload": [{"description": "Widget", "quantity": 1, "unit_price": 100}],
+            }),
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response["Access-Control-Allow-Origin"], "*")
+        pk = response.json()["id"]
+        response = self.client.get(f"/invoices/api/{pk}/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Access-Control-Allow-Origin"], "*")
+        self.assertEqual(response.json()["grand_total"], 121.0)
+
+    def test_create_returns_validation_messages(self):
+        response = self.client.post(
+            "/invoices/api/create/", json.dumps({}), content_type="application/json"
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            response.json()["errors"]["customer_name"], ["This field is required."]
+        )
+
+    def test_update_returns_validation_messages(self):
+        created = self.client.post(
+            "/invoices/api/create/",
+            json.dumps({"customer_name": "ACME"}),
+            content_type="application/json",
+        ).json()
+        response = self.client.put(
+            f"/invoices/api/{created['id']}/",
+            json.dumps({"customer_name": ""}),
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            response.json()["errors"]["customer_name"], ["This field is required."]
+        )
+
+    def test_create_rejects_overlong_customer_name(self):
+        response = self.client.post(
+            "/invoices/api/create/",
+            json.dumps({"customer_name": "x" * 400}),
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            response.json()["errors"]["customer_name"],
+            ["Ensure this value has at most 255 characters (it has 400)."],
+        )
+
+    def test_preview_sanitizes_prelisted_items(self):
+        response = self.client.post(
+            "/invoices/api/calculate-preview/",
+            json.dumps({
+                "items_payload": [
+                    {"description": "Widget", "quantity": "2", "unit_price": "abc"},
+                    "notadict",
+                ],
+            }),
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["subtotal"], 0.0)
+
+    def test_pdf_download_revalidates_with_etag(self):
+        invoice = Invoice.objects.create(customer_name="ACME")
+        etag = f'"{invoice.pk}-{int(invoice.updated_at.timestamp() * 1000)}"'
+        response = self.client.get(
+            f"/invoices/{invoice.pk}/pdf/", HTTP_IF_NONE_MATCH=etag
+        )
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+
+    def test_read_body_rejects_inflated_content_length(self):
+        from django.core.exceptions import RequestDataTooBig
+        from django.test import RequestFactory
+
+        from . import api
+
+        request = RequestFactory().post(
+            "/invoices/api/create/", b'{"customer_name": "ACME"}',
+            content_type="application/json",
+        )
+        # A lying Content-Length must not be preallocated; the fallback to
+        # request.body enforces DATA_UPLOAD_MAX_MEMORY_SIZE as before
+        request.META["CONTENT_LENGTH"] = "10000000000"
+        with self.assertRaises(RequestDataTooBig):
+            api._read_body(request)
+
+    def test_config_carries_cors_headers(self):
+        response = self.client.get("/invoices/api/config/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Access-Control-Allow-Origin"], "*")
+        self.assertIn("tax_settings", response.json())
+
+
 class NumberingTests(SimpleTestCase):
     def test_formats_invoice_number(self):
         self.assertEqual(numbering.format_invoice_number(None), "INV-NEW")
@@ -1,5 +1,13 @@
+import functools
 import json
+from collections import OrderedDict
 from http import HTTPStatus
+from io import BytesIO
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - stdlib fallback keeps views working
+    orjson = None
 
 from django.conf import settings
 from django.http import HttpRequest, HttpResponse, JsonResponse
@@ -11,21 +19,27 @@ from .forms import InvoiceForm
 from .models import Invoice
 
 
+@functools.lru_cache(maxsize=1)
+def _tax_row_skeleton(tax_items: tuple) -> tuple:
+    # The name/rate/rate_percent triple is fixed per settings snapshot;
+    # rendering only varies in the per-invoice amount spliced in below
+    return tuple(
+        {"name": name, "rate": rate, "rate_percent": round(rate * 100, 2)}
+        for name, rate in tax_items
+    )
+
+
 def _build_tax_rows(invoice: Invoice | None) -> list[dict[str, object]]:
     levies = {}
     if invoice is not None:
         levies = invoice.levies or {}
+    skeleton = _tax_row_skeleton(tuple(settings.TAX_SETTINGS.items()))
     rows: list[dict[str, object]] = []
-    for name, rate in settings.TAX_SETTINGS.items():
-        amount = levies.get(name)
+    for row in skeleton:
+        amount = levies.get(row["name"])
         if amount is not None:
             amount = f"{float(amount):.2f}"
-        rows.append({
-            "name": name,
-            "rate": rate,
-            "rate_percent": round(rate * 100, 2),
-            "amount": amount,
-        })
+        rows.append({**row, "amount": amount})
     return rows
 
 
@@ -74,9 +88,40 @@ class InvoiceDetailView(TemplateView):
         return context
 
 
+# Bounded memo for rendered PDFs. Keyed on (pk, updated_at) — the rendered
+# HTML cannot serve as the key because the CSRF token in the form is
+# re-masked on every request, so the bytes never repeat.
+_PDF_CACHE: OrderedDict = OrderedDict()
+_PDF_CACHE_LIMIT = 32
+
+
+def _write_pdf_cached(cache_key, html_bytes: bytes) -> bytes:
+    pdf = _PDF_CACHE.get(cache_key)
+    if pdf is not None:
+        _PDF_CACHE.move_to_end(cache_key)
+        return pdf
+    # Only reached after the availability probe in the view has succeeded
+    from weasyprint import HTML
+
+    pdf = _PDF_CACHE[cache_key] = HTML(file_obj=BytesIO(html_bytes)).write_pdf()
+    if len(_PDF_CACHE) > _PDF_CACHE_LIMIT:
+        _PDF_CACHE.popitem(last=False)
+    return pdf
+
+
 def invoice_pdf(request: HttpRequest, pk: int) -> HttpResponse:
     invoice = Invoice.objects.get(pk=pk)
-    html_string = render(
+    # Same pk-and-modification validator get_invoice uses; checked before
+    # rendering so a revalidation hit skips the template and the PDF work
+    etag = f'"{invoice.pk}-{int(invoice.updated_at.timestamp() * 1000)}"'
+    if request.META.get("HTTP_IF_NONE_MATCH") == etag:
+        response = HttpResponse(status=HTTPStatus.NOT_MODIFIED)
+        response["ETag"] = etag
+        response["Cache-Control"] = "private, max-age=300"
+        return response
+    # Keep the rendered document as bytes; decoding to str only for
+    # WeasyPrint to re-encode wastes two passes over the full HTML
+    html_bytes = render(
         request,
         "invoice.html",
         {
@@ -86,26 +131,32 @@ def invoice_pdf(request: HttpRequest, pk: int) -> HttpResponse:
             "tax_rows": _build_tax_rows(invoice),
             "form": InvoiceForm(instance=invoice),
         },
-    ).content.decode("utf-8")
+    ).content
 
-    # Lazy import to avoid loading GTK libraries at module import time
+    # Lazy import to avoid loading GTK libraries at module import time;
+    # the cached renderer below re-imports from sys.modules for free
     try:
-        from weasyprint import HTML
+        import weasyprint  # noqa: F401 - availability probe
     except (ImportError, OSError):  # OSError for missing GTK libraries
-        response = HttpResponse(html_string, content_type="text/html")
+        response = HttpResponse(html_bytes, content_type="text/html")
         response["X-WeasyPrint-Disabled"] = "1"
         return response
 
-    pdf_file = HTML(string=html_string).write_pdf()
+    pdf_file = _write_pdf_cached((invoice.pk, invoice.updated_at), html_bytes)
     response = HttpResponse(pdf_file, content_type="application/pdf")
     response["Content-Disposition"] = f"attachment; filename={invoice.invoice_number}.pdf"
+    response["ETag"] = etag
+    response["Cache-Control"] = "private, max-age=300"
     return response
 
 
 def invoice_calculate_preview(request: HttpRequest) -> HttpResponse:
     if request.method != "POST":
         return HttpResponse(status=HTTPStatus.METHOD_NOT_ALLOWED)
-    data = json.loads(request.body or "{}")
+    body = request.body or b"{}"
+    # Preview fires on every keystroke in the item grid, so the C codec
+    # matters here more than anywhere else in the views
+    data = orjson.loads(body) if orjson is not None else json.loads(body)
     form = InvoiceForm(data or None)
     form.is_valid()
     items_payload = data.get("items_payload", "[]")
@@ -113,10 +164,11 @@ def invoice_calculate_preview(request: HttpRequest) -> HttpResponse:
     temp_invoice = Invoice(customer_name=form.cleaned_data.get("customer_name", ""))
     temp_invoice.items = items
     temp_invoice.recalculate()
-    return JsonResponse(
-        {
-            "subtotal": float(temp_invoice.subtotal),
-            "levies": {name: float(amount) for name, amount in temp_invoice.levies.items()},
-            "grand_total": float(temp_invoice.grand_total),
-        }
-    )
+    payload = {
+        "subtotal": float(temp_invoice.subtotal),
+        "levies": {name: float(amount) for name, amount in temp_invoice.levies.items()},
+        "grand_total": float(temp_invoice.grand_total),
+    }
+    if orjson is not None:
+        return HttpResponse(orjson.dumps(payload), content_type="application/json")
+    return JsonResponse(payload)
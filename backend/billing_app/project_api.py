@@ -21,9 +21,6 @@ def _method_not_allowed() -> HttpResponse:
 
 @csrf_exempt
 def export_project(request: HttpRequest) -> HttpResponse:
-    if request.method == "OPTIONS":
-        return _cors(HttpResponse(status=HTTPStatus.NO_CONTENT))
-
     if request.method != "POST":
         return _method_not_allowed()
 
@@ -38,9 +35,6 @@ def export_project(request: HttpRequest) -> HttpResponse:
 
 @csrf_exempt
 def import_project(request: HttpRequest) -> HttpResponse:
-    if request.method == "OPTIONS":
-        return _cors(HttpResponse(status=HTTPStatus.NO_CONTENT))
-
     if request.method != "POST":
         return _method_not_allowed()
 
@@ -34,6 +34,8 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     # Middleware classes for request processing
+    "billing_app.middleware.PreflightMiddleware",
+    # Answers CORS OPTIONS preflights before any other processing
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -75,6 +77,9 @@ DATABASES = {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": BASE_DIR / "db.sqlite3",
         # SQLite database file path
+        "CONN_MAX_AGE": None,
+        # Keep the SQLite connection open between requests instead of
+        # reopening the database file on every hit
     }
 }
 
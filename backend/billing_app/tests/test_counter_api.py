@@ -0,0 +1,25 @@
+from django.test import TestCase
+
+
+class CounterApiTests(TestCase):
+    def test_next_number_peek_and_reserve(self):
+        response = self.client.get("/api/counter/invoice/next/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Access-Control-Allow-Origin"], "*")
+        self.assertEqual(response.json()["next_number"], "INV-0001")
+        response = self.client.post("/api/counter/invoice/next/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["next_number"], "INV-0001")
+
+    def test_unknown_kind_is_404_with_cors(self):
+        response = self.client.get("/api/counter/quotes/next/")
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response["Access-Control-Allow-Origin"], "*")
+
+    def test_reserve_range(self):
+        response = self.client.post("/api/counter/receipt/reserve/?n=5")
+        self.assertEqual(response.status_code, 200)
+        payload = response.json()
+        self.assertEqual(payload["start"], 1)
+        self.assertEqual(payload["end"], 5)
+        self.assertEqual(payload["prefix"], "REC")
@@ -9,9 +9,9 @@ from django.views.decorators.csrf import csrf_exempt
 # Lazy import to avoid premature model loading
 def get_counter_view(view_name):
     @csrf_exempt
-    def lazy_view(request):
+    def lazy_view(request, **kwargs):
         from billing_app import counter_api
-        return getattr(counter_api, view_name)(request)
+        return getattr(counter_api, view_name)(request, **kwargs)
     return lazy_view
 
 
@@ -35,9 +35,8 @@ urlpatterns = [
     path("waybills/", include("waybills.urls")),
     # Include waybills app URLs
     # Counter API endpoints (lazy-loaded to avoid model import at URL config time)
-    path("api/counter/invoice/next/", get_counter_view("get_next_invoice_number"), name="next-invoice-number"),
-    path("api/counter/receipt/next/", get_counter_view("get_next_receipt_number"), name="next-receipt-number"),
-    path("api/counter/waybill/next/", get_counter_view("get_next_waybill_number"), name="next-waybill-number"),
+    path("api/counter/<str:kind>/next/", get_counter_view("next_number"), name="next-document-number"),
+    path("api/counter/<str:kind>/reserve/", get_counter_view("reserve_range"), name="reserve-document-range"),
     path("api/counter/counts/", get_counter_view("get_document_counts"), name="document-counts"),
     path("api/project/export/", get_project_view("export_project"), name="project-export"),
     path("api/project/import/", get_project_view("import_project"), name="project-import"),
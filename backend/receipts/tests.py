@@ -1,4 +1,6 @@
-from django.test import SimpleTestCase
+import json
+
+from django.test import SimpleTestCase, TestCase
 
 from .services import numbering
 
@@ -7,3 +9,19 @@ class NumberingTests(SimpleTestCase):
     def test_formats_receipt_number(self):
         self.assertEqual(numbering.format_receipt_number(None), "REC-NEW")
         self.assertEqual(numbering.format_receipt_number(42), "REC-00042")
+
+
+class ReceiptApiTests(TestCase):
+    def test_create_and_get_roundtrip(self):
+        response = self.client.post(
+            "/receipts/api/create/",
+            json.dumps({"received_from": "ACME", "amount": "150.00", "issue_date": "2026-08-28"}),
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response["Access-Control-Allow-Origin"], "*")
+        pk = response.json()["id"]
+        response = self.client.get(f"/receipts/api/{pk}/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Access-Control-Allow-Origin"], "*")
+        self.assertEqual(response.json()["amount"], 150.0)
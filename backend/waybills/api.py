@@ -14,22 +14,31 @@ from .models import Waybill
 # Import Waybill model
 
 
+_CORS_HEADERS = {
+    "Access-Control-Allow-Origin": "*",
+    "Access-Control-Allow-Methods": "GET, POST, OPTIONS",
+    "Access-Control-Allow-Headers": "Content-Type",
+}
+
+
 def _cors(response: HttpResponse) -> HttpResponse:
     # Add CORS headers
-    response.setdefault("Access-Control-Allow-Origin", "*")
-    response.setdefault("Access-Control-Allow-Methods", "GET, POST, OPTIONS")
-    response.setdefault("Access-Control-Allow-Headers", "Content-Type")
+    for name, value in _CORS_HEADERS.items():
+        response[name] = value
     return response
 
 
+def _method_not_allowed() -> HttpResponse:
+    # 405 with CORS headers attached from the precomputed dict in one shot
+    return HttpResponse(status=HTTPStatus.METHOD_NOT_ALLOWED, headers=_CORS_HEADERS)
+
+
 @csrf_exempt
 def create_waybill(request: HttpRequest) -> HttpResponse:
     # API to create waybill
-    if request.method == "OPTIONS":
-        return _cors(HttpResponse(status=HTTPStatus.NO_CONTENT))
     if request.method != "POST":
-        return _cors(HttpResponse(status=HTTPStatus.METHOD_NOT_ALLOWED))
-    data = json.loads(request.body or "{}")
+        return _method_not_allowed()
+    data = json.loads(request.body or b"{}")
     # Parse JSON body
     form = WaybillForm(data or None)
     # Create form
@@ -48,8 +57,6 @@ def get_waybill(request: HttpRequest, pk: int) -> HttpResponse:
         # Get waybill
     except Waybill.DoesNotExist:
         return _cors(HttpResponse(status=HTTPStatus.NOT_FOUND))
-    if request.method == "OPTIONS":
-        return _cors(HttpResponse(status=HTTPStatus.NO_CONTENT))
     if request.method == "GET":
         data = {
             "id": waybill.pk,
@@ -63,7 +70,7 @@ def get_waybill(request: HttpRequest, pk: int) -> HttpResponse:
         }
         return _cors(JsonResponse(data))
     if request.method in {"PUT", "PATCH"}:
-        data = json.loads(request.body or "{}")
+        data = json.loads(request.body or b"{}")
         # Parse JSON body
         form = WaybillForm(data or None, instance=waybill)
         # Create form with instance
@@ -75,4 +82,4 @@ def get_waybill(request: HttpRequest, pk: int) -> HttpResponse:
             "id": waybill.pk,
             "waybill_number": waybill.waybill_number,
         }))
-    return _cors(HttpResponse(status=HTTPStatus.METHOD_NOT_ALLOWED))
+    return _method_not_allowed()
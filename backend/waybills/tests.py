@@ -1,4 +1,6 @@
-from django.test import SimpleTestCase
+import json
+
+from django.test import SimpleTestCase, TestCase
 
 from .services import numbering
 
@@ -7,3 +9,19 @@ class NumberingTests(SimpleTestCase):
     def test_formats_waybill_number(self):
         self.assertEqual(numbering.format_waybill_number(None), "WB-NEW")
         self.assertEqual(numbering.format_waybill_number(7), "WB-00007")
+
+
+class WaybillApiTests(TestCase):
+    def test_create_and_get_roundtrip(self):
+        response = self.client.post(
+            "/waybills/api/create/",
+            json.dumps({"customer_name": "ACME", "destination": "Accra", "issue_date": "2026-08-28"}),
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response["Access-Control-Allow-Origin"], "*")
+        pk = response.json()["id"]
+        response = self.client.get(f"/waybills/api/{pk}/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Access-Control-Allow-Origin"], "*")
+        self.assertEqual(response.json()["destination"], "Accra")